@@ -1,11 +1,16 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.services.document import init_pdf_pool, close_pdf_pool
+from app.services.embed_cache import drain_pending_writes
+from app.services.llm import init_llm, close_llm
+from app.services.reranker import init_reranker, close_reranker
 from app.storage.database import init_db, close_db
-from app.storage.vector import init_qdrant
+from app.storage.vector import init_qdrant, close_qdrant
 
 logging.basicConfig(
     level=logging.INFO,
@@ -16,11 +21,15 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await init_db()
-    await init_qdrant()
+    await asyncio.gather(init_db(), init_qdrant())
+    init_llm()
+    init_pdf_pool()
+    init_reranker()
     logger.info("ready")
     yield
-    await close_db()
+    close_pdf_pool()
+    await drain_pending_writes()
+    await asyncio.gather(close_llm(), close_reranker(), close_qdrant(), close_db())
 
 
 app = FastAPI(
@@ -53,4 +62,5 @@ async def health():
         "status": "ok",
         "openai_configured": bool(settings.openai_api_key),
         "cohere_configured": bool(settings.cohere_api_key),
+        "reranker": settings.reranker,
     }
@@ -0,0 +1,25 @@
+import time
+from datetime import UTC, datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class FrozenModel(BaseModel):
+    """immutable once constructed; nothing in the app mutates its models"""
+
+    model_config = ConfigDict(frozen=True)
+
+
+_now_bucket: int = -1
+_now_value: datetime = datetime.min.replace(tzinfo=UTC)
+
+
+def now_cached() -> datetime:
+    """utc now, reused for every call within the same ~1ms monotonic bucket.
+    bursts of ASR segments share one datetime instead of allocating each."""
+    global _now_bucket, _now_value
+    bucket = time.monotonic_ns() >> 20
+    if bucket != _now_bucket:
+        _now_bucket = bucket
+        _now_value = datetime.now(UTC)
+    return _now_value
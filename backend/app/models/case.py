@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import enum
-import uuid
+import secrets
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+from pydantic import Field
+
+from app.models.base import FrozenModel
 
 
 class Party(str, enum.Enum):
@@ -17,35 +19,35 @@ class Treatment(str, enum.Enum):
     SIDE_BY_SIDE = "side_by_side"
 
 
-class CaseCreate(BaseModel):
+class CaseCreate(FrozenModel):
     name: str
     description: str = ""
 
 
-class Case(BaseModel):
-    id: str = Field(default_factory=lambda: uuid.uuid4().hex[:12])
+class Case(FrozenModel):
+    id: str = Field(default_factory=lambda: secrets.token_hex(6))
     name: str
     description: str = ""
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
-class RosterMapping(BaseModel):
+class RosterMapping(FrozenModel):
     zoom_user_id: str
     zoom_user_name: str
     party: Party
 
 
-class SessionCreate(BaseModel):
+class SessionCreate(FrozenModel):
     case_id: str
     zoom_meeting_id: str = ""
-    roster: list[RosterMapping] = []
+    roster: list[RosterMapping] = Field(default_factory=list)
 
 
-class Session(BaseModel):
-    id: str = Field(default_factory=lambda: uuid.uuid4().hex[:12])
+class Session(FrozenModel):
+    id: str = Field(default_factory=lambda: secrets.token_hex(6))
     case_id: str
     zoom_meeting_id: str = ""
     treatment: Treatment = Treatment.NEUTRALIZER
-    roster: list[RosterMapping] = []
+    roster: list[RosterMapping] = Field(default_factory=list)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     active: bool = True
@@ -1,30 +1,32 @@
 from __future__ import annotations
 
-from pydantic import BaseModel
+from pydantic import Field
 
+from app.models.base import FrozenModel
 
-class Citation(BaseModel):
+
+class Citation(FrozenModel):
     chunk_id: str
     doc_name: str
     page: int
     snippet: str
 
 
-class ChallengeRequest(BaseModel):
+class ChallengeRequest(FrozenModel):
     session_id: str
 
 
-class ChallengeResponse(BaseModel):
+class ChallengeResponse(FrozenModel):
     treatment: str
     query_used: str
     no_evidence: bool = False
 
     # neutralizer fields
     summary: str = ""
-    citations: list[Citation] = []
+    citations: list[Citation] = Field(default_factory=list)
 
     # side_by_side fields
     party_a_evidence: str = ""
-    party_a_citations: list[Citation] = []
+    party_a_citations: list[Citation] = Field(default_factory=list)
     party_b_evidence: str = ""
-    party_b_citations: list[Citation] = []
+    party_b_citations: list[Citation] = Field(default_factory=list)
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
+from app.models.base import FrozenModel
 
-class Document(BaseModel):
+
+class Document(FrozenModel):
     id: str
     case_id: str
     party: str  # "A" or "B"
@@ -15,8 +17,8 @@ class Document(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
-class Chunk(BaseModel):
-    id: str  # {doc_id}:{page}:{start_char}-{end_char}
+class Chunk(FrozenModel):
+    id: str  # {doc_id}:{page}:{section}:{start_char}-{end_char}
     doc_id: str
     case_id: str
     party: str
@@ -2,19 +2,21 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
+from app.models.base import FrozenModel, now_cached
 
-class Turn(BaseModel):
+
+class Turn(FrozenModel):
     speaker_id: str = ""
     speaker_name: str = ""
     party: str = ""  # "A", "B", or "" if unmapped
     text: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=now_cached)
     token_count: int = 0
 
 
-class TranscriptBufferState(BaseModel):
+class TranscriptBufferState(FrozenModel):
     session_id: str
-    turns: list[Turn] = []
+    turns: list[Turn] = Field(default_factory=list)
     total_tokens: int = 0
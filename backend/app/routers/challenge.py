@@ -1,10 +1,15 @@
+import logging
+
+import orjson
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
 from app.models.challenge import ChallengeResponse
-from app.services.rag import run_challenge
+from app.services.rag import retrieve, run_challenge, stream_challenge
 from app.storage.database import get_session
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 @router.post("/{session_id}")
@@ -13,3 +18,38 @@ async def trigger_challenge(session_id: str) -> ChallengeResponse:
     if not sess:
         raise HTTPException(404, "session not found")
     return await run_challenge(sess)
+
+
+@router.post("/{session_id}/stream")
+async def trigger_challenge_stream(session_id: str) -> StreamingResponse:
+    """server-sent events: `citations`, then `delta` ({field, text}) per token
+    batch, then `done`. `result` carries a no_evidence response, `error` a
+    failure after the stream started. retrieval runs before the response
+    starts, so its failures are plain 4xx."""
+    sess = await get_session(session_id)
+    if not sess:
+        raise HTTPException(404, "session not found")
+    try:
+        query_text, top_results = await retrieve(sess)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+    async def events():
+        try:
+            async for event, data in stream_challenge(sess, query_text, top_results):
+                yield _sse(event, data)
+        except Exception:
+            # headers are already sent; report in-band instead of cutting the stream
+            logger.exception("challenge stream failed for session %s", session_id)
+            yield _sse("error", {"detail": "challenge generation failed"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # keep proxies (including the next.js /api rewrite) from buffering
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, data: dict) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
@@ -1,8 +1,10 @@
+import asyncio
+
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 
 from app.models.document import Document
-from app.services.document import ingest_document
-from app.storage.database import get_documents_for_case, get_case
+from app.services.document import ingest_document, save_upload
+from app.storage.database import get_documents_for_case, case_exists
 
 router = APIRouter()
 
@@ -18,15 +20,17 @@ async def upload_document(
     if not file.filename:
         raise HTTPException(400, "file is required")
 
-    case = await get_case(case_id)
-    if not case:
+    if not await case_exists(case_id):
         raise HTTPException(404, f"case {case_id} not found")
 
-    content = await file.read()
-    if not content:
-        raise HTTPException(400, "empty file")
+    try:
+        doc_id, storage_path = await asyncio.to_thread(
+            save_upload, case_id, file.filename, file.file,
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
 
-    doc = await ingest_document(case_id, party, file.filename, content)
+    doc = await ingest_document(doc_id, case_id, party, file.filename, storage_path)
     return doc
 
 
@@ -1,11 +1,10 @@
-import uuid
-
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from app.models.case import Case, Session, Treatment
 from app.storage.database import (
     create_case,
+    case_exists,
     get_case,
     list_cases,
     create_session,
@@ -27,8 +26,7 @@ class CreateSessionBody(BaseModel):
 
 @router.post("/cases")
 async def new_case(body: CreateCaseBody) -> Case:
-    case_id = uuid.uuid4().hex[:12]
-    case = Case(id=case_id, name=body.name, description=body.description)
+    case = Case(name=body.name, description=body.description)
     await create_case(case)
     return case
 
@@ -48,8 +46,7 @@ async def get_one_case(case_id: str) -> Case:
 
 @router.post("/cases/{case_id}/sessions")
 async def new_session(case_id: str, body: CreateSessionBody) -> Session:
-    case = await get_case(case_id)
-    if not case:
+    if not await case_exists(case_id):
         raise HTTPException(404, "case not found")
 
     try:
@@ -60,8 +57,7 @@ async def new_session(case_id: str, body: CreateSessionBody) -> Session:
             f"invalid treatment: {body.treatment}. use 'neutralizer' or 'side_by_side'",
         )
 
-    sess_id = uuid.uuid4().hex[:12]
-    sess = Session(id=sess_id, case_id=case_id, treatment=t)
+    sess = Session(case_id=case_id, treatment=t)
     await create_session(sess)
     return sess
 
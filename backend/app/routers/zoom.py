@@ -1,8 +1,11 @@
-import json
-
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from app.services.transcript import add_turn, get_turns
+from app.services.transcript import (
+    add_turn,
+    buffer_size,
+    get_encoded_turns,
+)
 
 router = APIRouter()
 
@@ -11,32 +14,60 @@ router = APIRouter()
 async def transcript_ws(ws: WebSocket, session_id: str):
     """manual transcript input via websocket for development and testing.
     send: {"speaker": "Party A", "text": "..."}
-    recv: {"ok": true, "buffer_size": N, "turns": [...]}"""
+    recv: {"ok": true, "buffer_size": N, "turn": {...}} for a new turn, or
+    {"ok": true, "buffer_size": N, "append": "...", "speaker": "...", "timestamp": ...}
+    when the segment was merged into the last turn (same speaker); the client
+    joins `append` onto that turn's text with a space.
+    send {"op": "resync"} to receive the whole buffer as
+    {"ok": true, "buffer_size": N, "turns": [...]}"""
     await ws.accept()
 
     try:
         while True:
             data = await ws.receive_text()
-            msg = json.loads(data)
+            msg = orjson.loads(data)
+
+            # turns are stored pre-encoded; splice their bytes into the reply
+            if msg.get("op") == "resync":
+                encoded = get_encoded_turns(session_id)
+                await _send_raw(
+                    ws,
+                    b'{"ok":true,"buffer_size":' + str(len(encoded)).encode()
+                    + b',"turns":[' + b",".join(encoded) + b"]}",
+                )
+                continue
 
             speaker = msg.get("speaker", "Unknown")
             text = msg.get("text", "")
             if not text.strip():
-                await ws.send_json({"error": "empty text"})
+                await _send(ws, {"error": "empty text"})
                 continue
 
-            add_turn(session_id, speaker, text)
-            turns = get_turns(session_id)
-
-            await ws.send_json({
-                "ok": True,
-                "buffer_size": len(turns),
-                "turns": [
-                    {"speaker": t.speaker, "text": t.text, "timestamp": t.timestamp.isoformat()}
-                    for t in turns
-                ],
-            })
+            turn, merged = add_turn(session_id, speaker, text)
+            size = buffer_size(session_id)
+            if merged:
+                # echo only the new segment; re-encoding the whole turn per
+                # segment would make a long monologue quadratic
+                await _send(ws, {
+                    "ok": True, "buffer_size": size,
+                    "append": text, "speaker": speaker, "timestamp": turn.timestamp,
+                })
+                continue
+            await _send_raw(
+                ws,
+                b'{"ok":true,"buffer_size":' + str(size).encode()
+                + b',"turn":' + turn.to_json() + b"}",
+            )
     except WebSocketDisconnect:
         pass
     except Exception:
         await ws.close(code=1011)
+
+
+async def _send(ws: WebSocket, payload: dict):
+    await _send_raw(ws, orjson.dumps(payload, option=orjson.OPT_NAIVE_UTC))
+
+
+async def _send_raw(ws: WebSocket, payload: bytes):
+    # text frame so browser clients can JSON.parse(event.data) directly
+    await ws.send_text(payload.decode())
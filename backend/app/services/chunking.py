@@ -0,0 +1,150 @@
+# pdf text extraction and chunking. runs inside the pdf process pool, so it
+# imports only what the workers need: no database, vector store or api clients
+
+import re
+
+import numpy as np
+import pymupdf
+import tiktoken
+
+from app.config import settings
+from app.models.document import Chunk, Document
+
+_enc: tiktoken.Encoding | None = None
+
+# blank lines (with any surrounding whitespace) separate paragraphs
+_PARAGRAPH_SPLIT_RE = re.compile(r"\s*\n\s*\n\s*")
+
+
+def _get_encoder() -> tiktoken.Encoding:
+    """loaded on first use, once per pool worker. the first load fetches the
+    BPE file unless TIKTOKEN_CACHE_DIR already holds it"""
+    global _enc
+    if _enc is None:
+        _enc = tiktoken.get_encoding("cl100k_base")
+    return _enc
+
+
+def extract_text(path: str) -> tuple[list[tuple[int, str]], int]:
+    pages_text: list[tuple[int, str]] = []
+
+    with pymupdf.open(path, filetype="pdf") as pdf:
+        page_count = pdf.page_count
+        for i, page in enumerate(pdf):
+            text = page.get_text("text")
+            if text.strip():
+                pages_text.append((i + 1, text))
+
+    return pages_text, page_count
+
+
+def _is_heading(para: str) -> bool:
+    """single-line ALL CAPS or Title Case paragraph, no trailing period.
+    str.isupper/istitle need at least one cased letter, so page numbers and
+    dates never qualify"""
+    return (
+        len(para) < 120
+        and "\n" not in para
+        and (para.isupper() or para.istitle())
+        and not para.endswith(".")
+    )
+
+
+def chunk_pages(doc: Document, pages_text: list[tuple[int, str]]) -> list[Chunk]:
+    chunks: list[Chunk] = []
+    chunk_size = settings.chunk_size_tokens
+    overlap = int(chunk_size * settings.chunk_overlap_pct)
+    # sections are flushed on a cheap character estimate; windows are exact tokens
+    flush_chars = settings.chunk_size_chars * 2
+
+    for page_num, full_text in pages_text:
+        paragraphs = [p for p in _PARAGRAPH_SPLIT_RE.split(full_text.strip()) if p]
+        current_section = ""
+        section_title = ""
+        # ordinal of the section on this page; chunk offsets are section-relative,
+        # so the ordinal keeps ids unique when two sections have equal lengths
+        section_idx = 0
+
+        for para in paragraphs:
+            if _is_heading(para):
+                if current_section.strip():
+                    _split_into_chunks(
+                        chunks, doc, page_num, section_idx, current_section, section_title,
+                        chunk_size, overlap,
+                    )
+                    section_idx += 1
+                    current_section = ""
+                section_title = para
+                continue
+
+            current_section += para + "\n\n"
+
+            if len(current_section) >= flush_chars:
+                _split_into_chunks(
+                    chunks, doc, page_num, section_idx, current_section, section_title,
+                    chunk_size, overlap,
+                )
+                section_idx += 1
+                current_section = ""
+
+        if current_section.strip():
+            _split_into_chunks(
+                chunks, doc, page_num, section_idx, current_section, section_title,
+                chunk_size, overlap,
+            )
+
+    return chunks
+
+
+def _split_into_chunks(
+    chunks: list[Chunk],
+    doc: Document,
+    page_num: int,
+    section_idx: int,
+    section_text: str,
+    section_title: str,
+    chunk_size: int,
+    overlap: int,
+):
+    """sliding windows of chunk_size tokens overlapping by overlap tokens.
+    chunk ids and offsets stay in characters of the section text."""
+    text = section_text.strip()
+    if not text:
+        return
+
+    parent_text = text
+    enc = _get_encoder()
+    tokens = enc.encode(text, disallowed_special=())
+    # char offset where each token starts, so windows slice the original text
+    token_starts = _token_char_starts(enc, text, tokens)
+    n = len(tokens)
+    step = max(chunk_size - overlap, 1)
+
+    for first in range(0, n, step):
+        last = min(first + chunk_size, n)
+        start = token_starts[first]
+        end = token_starts[last] if last < n else len(text)
+        # inputs come from our own parser, skip validation
+        chunks.append(Chunk.model_construct(
+            id=f"{doc.id}:{page_num}:{section_idx}:{start}-{end}",
+            doc_id=doc.id, case_id=doc.case_id, party=doc.party,
+            filename=doc.filename, page=page_num, start_char=start,
+            end_char=end, text=text[start:end].strip(), parent_text=parent_text,
+            section_title=section_title,
+        ))
+        if last >= n:
+            break
+
+
+def _token_char_starts(enc: tiktoken.Encoding, text: str, tokens: list[int]) -> list[int]:
+    """same offsets as enc.decode_with_offsets, whose pure-python walk over
+    every byte costs several times the encode itself. token byte lengths are
+    summed into byte starts, then mapped to chars by counting utf-8 lead bytes
+    in numpy; a token starting mid-character maps to that character's start."""
+    raw = np.frombuffer(text.encode(), dtype=np.uint8)
+    byte_starts = np.zeros(len(tokens), dtype=np.int64)
+    np.cumsum([len(b) for b in enc.decode_tokens_bytes(tokens[:-1])], out=byte_starts[1:])
+    is_cont = (raw & 0xC0) == 0x80
+    chars_before = np.zeros(len(raw) + 1, dtype=np.int64)
+    np.cumsum(~is_cont, out=chars_before[1:])
+    return (chars_before[byte_starts] - is_cont[byte_starts]).tolist()
@@ -1,38 +1,79 @@
+import asyncio
+import multiprocessing
 import os
-import tempfile
-import uuid
-
-import pdfplumber
+import secrets
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO
 
 from app.config import settings
-from app.models.document import Document, Chunk
-from app.services.llm import embed_texts
+from app.models.document import Document
+from app.services.chunking import chunk_pages, extract_text
+from app.services.embed_cache import embed_texts_cached
 from app.storage.database import save_document, save_chunks
 from app.storage.vector import upsert_chunks
 
 SUPPORTED_EXTENSIONS = {".pdf"}
+UPLOAD_CHUNK_BYTES = 1024 * 1024
 
+# pdf parsing and chunking are CPU bound; run them off the event loop.
+# workers only import app.services.chunking, not this module's db/api clients
+_pdf_pool: ProcessPoolExecutor | None = None
 
-async def ingest_document(
-    case_id: str, party: str, filename: str, content: bytes,
-) -> Document:
+
+def init_pdf_pool():
+    """spawn rather than fork: by the first upload the server already runs
+    to_thread workers, and forking a threaded process is unsafe"""
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn"),
+        )
+
+
+def close_pdf_pool():
+    global _pdf_pool
+    if _pdf_pool:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    if _pdf_pool is None:
+        raise RuntimeError("pdf pool not initialized")
+    return _pdf_pool
+
+
+def save_upload(case_id: str, filename: str, src: BinaryIO) -> tuple[str, str]:
+    """stream an uploaded file to disk in fixed-size chunks.
+    returns (doc_id, storage_path) with storage_path relative to upload_dir."""
     ext = os.path.splitext(filename)[1].lower()
     if ext not in SUPPORTED_EXTENSIONS:
         raise ValueError(f"unsupported file type: {ext}")
 
-    if not content:
-        raise ValueError("empty file")
-
-    doc_id = uuid.uuid4().hex[:12]
+    doc_id = secrets.token_hex(6)
 
     case_dir = os.path.join(settings.upload_dir, case_id)
     os.makedirs(case_dir, exist_ok=True)
     storage_path = os.path.join(case_id, f"{doc_id}_{filename}")
     full_path = os.path.join(settings.upload_dir, storage_path)
     with open(full_path, "wb") as f:
-        f.write(content)
+        shutil.copyfileobj(src, f, UPLOAD_CHUNK_BYTES)
 
-    pages_text, page_count = _extract_text(content)
+    if os.path.getsize(full_path) == 0:
+        os.unlink(full_path)
+        raise ValueError("empty file")
+
+    return doc_id, storage_path
+
+
+async def ingest_document(
+    doc_id: str, case_id: str, party: str, filename: str, storage_path: str,
+) -> Document:
+    loop = asyncio.get_running_loop()
+    pool = _get_pdf_pool()
+    full_path = os.path.join(settings.upload_dir, storage_path)
+    pages_text, page_count = await loop.run_in_executor(pool, extract_text, full_path)
     if not pages_text:
         raise ValueError(f"no text extracted from {filename}")
 
@@ -44,129 +85,15 @@ async def ingest_document(
         page_count=page_count,
         storage_path=storage_path,
     )
-    await save_document(doc)
-
-    chunks = _chunk_pages(doc, pages_text)
+    # the document row and the chunking are independent; overlap them
+    _, chunks = await asyncio.gather(
+        save_document(doc),
+        loop.run_in_executor(pool, chunk_pages, doc, pages_text),
+    )
     if not chunks:
         raise ValueError(f"no chunks produced from {filename}")
 
     texts_to_embed = [c.text for c in chunks]
-    embeddings = await embed_texts(texts_to_embed)
-    await upsert_chunks(chunks, embeddings)
-    await save_chunks(chunks)
+    embeddings = await embed_texts_cached(texts_to_embed)
+    await asyncio.gather(upsert_chunks(chunks, embeddings), save_chunks(chunks))
     return doc
-
-
-def _extract_text(content: bytes) -> tuple[list[tuple[int, str]], int]:
-    pages_text: list[tuple[int, str]] = []
-    page_count = 0
-
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-        tmp.write(content)
-        tmp_path = tmp.name
-
-    try:
-        with pdfplumber.open(tmp_path) as pdf:
-            page_count = len(pdf.pages)
-            for i, page in enumerate(pdf.pages):
-                text = page.extract_text() or ""
-                if text.strip():
-                    pages_text.append((i + 1, text))
-    finally:
-        os.unlink(tmp_path)
-
-    return pages_text, page_count
-
-
-def _chunk_pages(doc: Document, pages_text: list[tuple[int, str]]) -> list[Chunk]:
-    chunks: list[Chunk] = []
-    chunk_size = settings.chunk_size_chars
-    overlap = settings.chunk_overlap_chars
-
-    for page_num, full_text in pages_text:
-        paragraphs = [p.strip() for p in full_text.split("\n\n") if p.strip()]
-        current_section = ""
-        section_title = ""
-
-        for para in paragraphs:
-            lines = para.split("\n")
-            if (
-                len(lines) == 1
-                and len(para) < 120
-                and (para.isupper() or para.istitle())
-                and not para.endswith(".")
-            ):
-                if current_section.strip():
-                    _split_into_chunks(
-                        chunks, doc, page_num, current_section, section_title, chunk_size, overlap,
-                    )
-                    current_section = ""
-                section_title = para
-                continue
-
-            current_section += para + "\n\n"
-
-            if len(current_section) >= chunk_size * 2:
-                _split_into_chunks(
-                    chunks, doc, page_num, current_section, section_title, chunk_size, overlap,
-                )
-                current_section = ""
-
-        if current_section.strip():
-            _split_into_chunks(
-                chunks, doc, page_num, current_section, section_title, chunk_size, overlap,
-            )
-
-    return chunks
-
-
-def _split_into_chunks(
-    chunks: list[Chunk],
-    doc: Document,
-    page_num: int,
-    section_text: str,
-    section_title: str,
-    chunk_size: int,
-    overlap: int,
-):
-    text = section_text.strip()
-    if not text:
-        return
-
-    parent_text = text
-
-    if len(text) <= chunk_size:
-        chunk_id = f"{doc.id}:{page_num}:0-{len(text)}"
-        chunks.append(Chunk(
-            id=chunk_id, doc_id=doc.id, case_id=doc.case_id, party=doc.party,
-            filename=doc.filename, page=page_num, start_char=0, end_char=len(text),
-            text=text, parent_text=parent_text, section_title=section_title,
-        ))
-        return
-
-    start = 0
-    while start < len(text):
-        end = min(start + chunk_size, len(text))
-        chunk_text = text[start:end]
-
-        if end < len(text) and len(chunk_text) > 50:
-            last_period = chunk_text.rfind(". ")
-            last_newline = chunk_text.rfind("\n")
-            break_at = max(last_period, last_newline)
-            if break_at > len(chunk_text) * 0.5:
-                end = start + break_at + 1
-                chunk_text = text[start:end]
-
-        chunk_id = f"{doc.id}:{page_num}:{start}-{end}"
-        chunks.append(Chunk(
-            id=chunk_id, doc_id=doc.id, case_id=doc.case_id, party=doc.party,
-            filename=doc.filename, page=page_num, start_char=start, end_char=end,
-            text=chunk_text.strip(), parent_text=parent_text, section_title=section_title,
-        ))
-
-        if end >= len(text):
-            break
-        start = end - overlap
-        start = max(start, 0)
-        if start <= chunks[-1].start_char:
-            break
@@ -0,0 +1,75 @@
+import asyncio
+import hashlib
+import logging
+
+import numpy as np
+
+from app.config import settings
+from app.services.llm import embed_texts
+from app.storage.database import get_cached_embeddings, save_cached_embeddings
+
+MAX_PENDING_WRITES = 64
+
+logger = logging.getLogger(__name__)
+
+# cache writes run in the background so ingestion does not wait on them
+_pending: set[asyncio.Task] = set()
+
+
+def cache_key(text: str) -> bytes:
+    """content hash of text, keyed by the embedding model so a model change
+    never serves stale vectors"""
+    return hashlib.blake2b(
+        text.encode(), digest_size=16, key=settings.embedding_model.encode()[:64],
+    ).digest()
+
+
+async def embed_texts_cached(texts: list[str]) -> np.ndarray:
+    """embed_texts backed by the postgres embedding cache.
+    only texts not seen before (for this model) are sent to openai."""
+    out = np.empty((len(texts), settings.embedding_dim), dtype=np.float32)
+    if not texts:
+        return out
+    keys = [cache_key(t) for t in texts]
+    # cached rows stay float32 bytes until they are copied into out
+    vectors = await get_cached_embeddings(list(set(keys)))
+
+    # identical texts within the batch are embedded once
+    missing: dict[bytes, str] = {}
+    for key, text in zip(keys, texts):
+        if key not in vectors:
+            missing.setdefault(key, text)
+
+    if missing:
+        fresh = await embed_texts(list(missing.values()))
+        entries = {
+            k: row.astype(np.float32, copy=False).tobytes() for k, row in zip(missing, fresh)
+        }
+        await _schedule_write(entries)
+        vectors.update(entries)
+
+    for i, key in enumerate(keys):
+        out[i] = np.frombuffer(vectors[key], dtype=np.float32)
+    return out
+
+
+async def drain_pending_writes():
+    """wait for in-flight cache writes; call before the pool closes"""
+    if _pending:
+        await asyncio.wait(_pending)
+
+
+async def _schedule_write(entries: dict[bytes, bytes]):
+    # backpressure: never let more than MAX_PENDING_WRITES pile up
+    if len(_pending) >= MAX_PENDING_WRITES:
+        await asyncio.wait(_pending, return_when=asyncio.FIRST_COMPLETED)
+    task = asyncio.create_task(save_cached_embeddings(entries))
+    _pending.add(task)
+    task.add_done_callback(_on_write_done)
+
+
+def _on_write_done(task: asyncio.Task):
+    _pending.discard(task)
+    if not task.cancelled() and task.exception():
+        # a lost cache write only costs a future re-embed
+        logger.warning("embedding cache write failed: %s", task.exception())
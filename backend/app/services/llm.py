@@ -1,8 +1,36 @@
+import asyncio
+import hashlib
+import time
+from collections.abc import AsyncIterator
+
+import numpy as np
 from openai import AsyncOpenAI
 
 from app.config import settings
 
+EMBED_BATCH_SIZE = 512
+QUERY_CACHE_TTL = 60.0
+QUERY_CACHE_SIZE = 256
+
 _client: AsyncOpenAI | None = None
+# bounds in-flight embedding requests across all callers
+_embed_semaphore = asyncio.Semaphore(8)
+# sha1(query) -> (inserted_at, embedding); repeated challenges on an unchanged
+# transcript reuse the vector instead of another round trip
+_query_cache: dict[str, tuple[float, np.ndarray]] = {}
+
+
+def init_llm():
+    """create the shared client at startup instead of on the first request"""
+    if settings.openai_api_key:
+        _get_client()
+
+
+async def close_llm():
+    global _client
+    if _client:
+        await _client.close()
+        _client = None
 
 
 def _get_client() -> AsyncOpenAI:
@@ -10,26 +38,52 @@ def _get_client() -> AsyncOpenAI:
     if not settings.openai_api_key:
         raise RuntimeError("OPENAI_API_KEY is not set")
     if _client is None:
-        _client = AsyncOpenAI(api_key=settings.openai_api_key)
+        # the sdk retries 429s and 5xx with exponential backoff
+        _client = AsyncOpenAI(api_key=settings.openai_api_key, max_retries=5)
     return _client
 
 
-async def embed_texts(texts: list[str]) -> list[list[float]]:
+async def embed_texts(texts: list[str]) -> np.ndarray:
+    """(len(texts), embedding_dim) float32 array, rows in input order"""
+    out = np.empty((len(texts), settings.embedding_dim), dtype=np.float32)
     if not texts:
-        return []
+        return out
     client = _get_client()
-    all_embeddings: list[list[float]] = []
-    batch_size = 512
-    for i in range(0, len(texts), batch_size):
-        batch = texts[i : i + batch_size]
+    await asyncio.gather(*(
+        _embed_batch(client, texts[i : i + EMBED_BATCH_SIZE], out[i : i + EMBED_BATCH_SIZE])
+        for i in range(0, len(texts), EMBED_BATCH_SIZE)
+    ))
+    return out
+
+
+async def _embed_batch(client: AsyncOpenAI, batch: list[str], out: np.ndarray):
+    async with _embed_semaphore:
         resp = await client.embeddings.create(input=batch, model=settings.embedding_model)
-        all_embeddings.extend([d.embedding for d in resp.data])
-    return all_embeddings
+    out[:] = [d.embedding for d in resp.data]
+
+
+async def embed_query(text: str) -> np.ndarray:
+    key = hashlib.sha1(text.encode()).hexdigest()
+    hit = _query_cache.get(key)
+    if hit and time.monotonic() - hit[0] < QUERY_CACHE_TTL:
+        return hit[1]
 
+    result = (await embed_texts([text]))[0]
+    now = time.monotonic()
+    _query_cache.pop(key, None)
+    if len(_query_cache) >= QUERY_CACHE_SIZE:
+        _evict_queries(now)
+    _query_cache[key] = (now, result)
+    return result
 
-async def embed_query(text: str) -> list[float]:
-    result = await embed_texts([text])
-    return result[0]
+
+def _evict_queries(now: float):
+    expired = [k for k, (ts, _) in _query_cache.items() if now - ts >= QUERY_CACHE_TTL]
+    for k in expired:
+        del _query_cache[k]
+    # still full: drop the oldest insert
+    if len(_query_cache) >= QUERY_CACHE_SIZE:
+        del _query_cache[next(iter(_query_cache))]
 
 
 async def chat(system: str, user: str) -> str:
@@ -46,3 +100,20 @@ async def chat(system: str, user: str) -> str:
     if content is None:
         raise RuntimeError("LLM returned empty response")
     return content
+
+
+async def chat_stream(system: str, user: str) -> AsyncIterator[str]:
+    """same prompt shape as chat, yielding content deltas as they arrive"""
+    client = _get_client()
+    stream = await client.chat.completions.create(
+        model=settings.llm_model,
+        messages=[
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ],
+        temperature=0.2,
+        stream=True,
+    )
+    async for event in stream:
+        if event.choices and event.choices[0].delta.content:
+            yield event.choices[0].delta.content
@@ -1,15 +1,119 @@
 import asyncio
+from collections.abc import AsyncIterator
 
 from app.config import settings
 from app.models.case import Session
 from app.models.challenge import ChallengeResponse, Citation
-from app.services.llm import chat, embed_query
+from app.services.llm import chat, chat_stream, embed_query
 from app.services.reranker import rerank
 from app.services.transcript import get_turns, format_turns
 from app.storage.vector import hybrid_search
 
+NEUTRALIZER_SYSTEM = (
+    "you are Axio, a neutral evidence presenter for mediation.\n"
+    "rules:\n"
+    "- remove emotional language\n"
+    "- use 'the document states' not 'he said'\n"
+    "- include citation tags like [DocName, p.X] for every claim\n"
+    "- be concise and factual\n"
+    "- do not add information not in the evidence\n"
+    "- do not give legal advice"
+)
+
+SIDE_BY_SIDE_SYSTEM = (
+    "you are Axio, a neutral evidence presenter for mediation.\n"
+    "rules:\n"
+    "- accurately reflect what the documents say\n"
+    "- include citation tags like [DocName, p.X]\n"
+    "- present evidence, not conclusions\n"
+    "- do not give legal advice"
+)
+
 
 async def run_challenge(session: Session) -> ChallengeResponse:
+    query_text, top_results = await retrieve(session)
+    if not top_results:
+        return ChallengeResponse(
+            treatment=session.treatment.value,
+            query_used=query_text,
+            no_evidence=True,
+        )
+
+    # step 5: generate response with fixed prompt template
+    if session.treatment.value == "neutralizer":
+        return await _generate_neutralizer(query_text, top_results, session)
+    else:
+        return await _generate_side_by_side(query_text, top_results, session)
+
+
+async def stream_challenge(
+    session: Session, query_text: str, top_results: list[dict],
+) -> AsyncIterator[tuple[str, dict]]:
+    """generation half of run_challenge as (event, data) pairs, for results
+    already returned by retrieve(): citations first, then summary deltas while
+    the model generates, then done. an empty retrieval yields a single
+    no_evidence result instead."""
+    treatment = session.treatment.value
+    if not top_results:
+        yield "result", ChallengeResponse(
+            treatment=treatment, query_used=query_text, no_evidence=True,
+        ).model_dump()
+        return
+
+    if treatment == "neutralizer":
+        yield "citations", {
+            "treatment": treatment,
+            "query_used": query_text,
+            "citations": _dump_citations(top_results),
+        }
+        prompt = _neutralizer_prompt(query_text, top_results)
+        async for delta in chat_stream(NEUTRALIZER_SYSTEM, prompt):
+            yield "delta", {"field": "summary", "text": delta}
+    else:
+        party_a, party_b = _split_by_party(top_results)
+        yield "citations", {
+            "treatment": treatment,
+            "query_used": query_text,
+            "party_a_citations": _dump_citations(party_a),
+            "party_b_citations": _dump_citations(party_b),
+        }
+        # interleave both completions as their tokens arrive
+        queue: asyncio.Queue[tuple[str, str] | None] = asyncio.Queue()
+
+        async def pump(field: str, label: str, results: list[dict]):
+            try:
+                if not results:
+                    await queue.put((field, f"no relevant evidence from {label} documents."))
+                    return
+                prompt = _side_prompt(query_text, label, results)
+                async for delta in chat_stream(SIDE_BY_SIDE_SYSTEM, prompt):
+                    await queue.put((field, delta))
+            finally:
+                await queue.put(None)
+
+        tasks = [
+            asyncio.create_task(pump("party_a_evidence", "Party A", party_a)),
+            asyncio.create_task(pump("party_b_evidence", "Party B", party_b)),
+        ]
+        try:
+            running = len(tasks)
+            while running:
+                item = await queue.get()
+                if item is None:
+                    running -= 1
+                    continue
+                yield "delta", {"field": item[0], "text": item[1]}
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    yield "done", {}
+
+
+async def retrieve(session: Session) -> tuple[str, list[dict]]:
+    """steps 1-4. returns the query text and the reranked results, or an empty
+    list when nothing was found or the threshold gate rejected everything."""
     turns = get_turns(session.id)
     if not turns:
         raise ValueError("no transcript data available")
@@ -25,11 +129,7 @@ async def run_challenge(session: Session) -> ChallengeResponse:
     )
 
     if not raw_results:
-        return ChallengeResponse(
-            treatment=session.treatment.value,
-            query_used=query_text,
-            no_evidence=True,
-        )
+        return query_text, []
 
     # step 3: cross-encoder rerank
     top_results = await rerank(query_text, raw_results, top_k=settings.rerank_top_k)
@@ -37,40 +137,16 @@ async def run_challenge(session: Session) -> ChallengeResponse:
     # step 4: threshold gate
     score_key = "rerank_score" if top_results and "rerank_score" in top_results[0] else "score"
     if all(r.get(score_key, 0) < settings.similarity_threshold for r in top_results):
-        return ChallengeResponse(
-            treatment=session.treatment.value,
-            query_used=query_text,
-            no_evidence=True,
-        )
+        return query_text, []
 
-    # step 5: generate response with fixed prompt template
-    if session.treatment.value == "neutralizer":
-        return await _generate_neutralizer(query_text, top_results, session)
-    else:
-        return await _generate_side_by_side(query_text, top_results, session)
+    return query_text, top_results
 
 
 async def _generate_neutralizer(
     query_text: str, results: list[dict], session: Session,
 ) -> ChallengeResponse:
     citations = _build_citations(results)
-    evidence_text = _format_evidence(results)
-
-    system = (
-        "you are Axio, a neutral evidence presenter for mediation.\n"
-        "rules:\n"
-        "- remove emotional language\n"
-        "- use 'the document states' not 'he said'\n"
-        "- include citation tags like [DocName, p.X] for every claim\n"
-        "- be concise and factual\n"
-        "- do not add information not in the evidence\n"
-        "- do not give legal advice"
-    )
-    user = (
-        f"Current discussion:\n{query_text}\n\n"
-        f"Retrieved evidence:\n{evidence_text}"
-    )
-    summary = await chat(system, user)
+    summary = await chat(NEUTRALIZER_SYSTEM, _neutralizer_prompt(query_text, results))
 
     return ChallengeResponse(
         treatment="neutralizer",
@@ -83,36 +159,17 @@ async def _generate_neutralizer(
 async def _generate_side_by_side(
     query_text: str, results: list[dict], session: Session,
 ) -> ChallengeResponse:
-    party_a = [r for r in results if r.get("party") == "A"]
-    party_b = [r for r in results if r.get("party") == "B"]
-
-    system = (
-        "you are Axio, a neutral evidence presenter for mediation.\n"
-        "rules:\n"
-        "- accurately reflect what the documents say\n"
-        "- include citation tags like [DocName, p.X]\n"
-        "- present evidence, not conclusions\n"
-        "- do not give legal advice"
-    )
-
-    a_text = _format_evidence(party_a) if party_a else ""
-    b_text = _format_evidence(party_b) if party_b else ""
+    party_a, party_b = _split_by_party(results)
 
     async def gen_a():
-        if not a_text:
+        if not party_a:
             return "no relevant evidence from Party A documents."
-        return await chat(
-            system,
-            f"Current discussion:\n{query_text}\n\nParty A documents:\n{a_text}",
-        )
+        return await chat(SIDE_BY_SIDE_SYSTEM, _side_prompt(query_text, "Party A", party_a))
 
     async def gen_b():
-        if not b_text:
+        if not party_b:
             return "no relevant evidence from Party B documents."
-        return await chat(
-            system,
-            f"Current discussion:\n{query_text}\n\nParty B documents:\n{b_text}",
-        )
+        return await chat(SIDE_BY_SIDE_SYSTEM, _side_prompt(query_text, "Party B", party_b))
 
     party_a_summary, party_b_summary = await asyncio.gather(gen_a(), gen_b())
 
@@ -126,6 +183,23 @@ async def _generate_side_by_side(
     )
 
 
+def _neutralizer_prompt(query_text: str, results: list[dict]) -> str:
+    return (
+        f"Current discussion:\n{query_text}\n\n"
+        f"Retrieved evidence:\n{_format_evidence(results)}"
+    )
+
+
+def _side_prompt(query_text: str, label: str, results: list[dict]) -> str:
+    return f"Current discussion:\n{query_text}\n\n{label} documents:\n{_format_evidence(results)}"
+
+
+def _split_by_party(results: list[dict]) -> tuple[list[dict], list[dict]]:
+    party_a = [r for r in results if r.get("party") == "A"]
+    party_b = [r for r in results if r.get("party") == "B"]
+    return party_a, party_b
+
+
 def _build_citations(results: list[dict]) -> list[Citation]:
     return [
         Citation(
@@ -138,6 +212,10 @@ def _build_citations(results: list[dict]) -> list[Citation]:
     ]
 
 
+def _dump_citations(results: list[dict]) -> list[dict]:
+    return [c.model_dump() for c in _build_citations(results)]
+
+
 def _format_evidence(results: list[dict]) -> str:
     parts = []
     for r in results:
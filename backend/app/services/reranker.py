@@ -1,10 +1,53 @@
+import asyncio
+import math
+
 import httpx
 
 from app.config import settings
 
+COHERE_RERANK_URL = "https://api.cohere.com/v2/rerank"
+
+_client: httpx.AsyncClient | None = None
+_cross_encoder = None  # fastembed TextCrossEncoder when settings.reranker == "local"
+
+
+def init_reranker():
+    """load the local cross-encoder, or open the shared cohere client so every
+    rerank reuses warm connections"""
+    global _client, _cross_encoder
+    if settings.reranker == "local":
+        if _cross_encoder is None:
+            # optional dependency: pip install axio-backend[local-rerank]
+            from fastembed.rerank.cross_encoder import TextCrossEncoder
+
+            _cross_encoder = TextCrossEncoder(model_name=settings.local_reranker_model)
+        return
+    if _client is None:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=5.0,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            headers={"Authorization": f"Bearer {settings.cohere_api_key}"},
+        )
+
+
+async def close_reranker():
+    global _client
+    if _client:
+        await _client.aclose()
+        _client = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    if _client is None:
+        raise RuntimeError("reranker not initialized")
+    return _client
+
 
 async def rerank(query: str, results: list[dict], top_k: int | None = None) -> list[dict]:
     top_k = top_k or settings.rerank_top_k
+    if settings.reranker == "local":
+        return await asyncio.to_thread(_local_rerank, query, results, top_k)
     if not settings.cohere_api_key:
         raise RuntimeError("COHERE_API_KEY is not set")
     return await _cohere_rerank(query, results, top_k)
@@ -15,22 +58,17 @@ async def _cohere_rerank(query: str, results: list[dict], top_k: int) -> list[di
     if not documents:
         return []
 
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        resp = await client.post(
-            "https://api.cohere.com/v2/rerank",
-            headers={
-                "Authorization": f"Bearer {settings.cohere_api_key}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "model": "rerank-v3.5",
-                "query": query,
-                "documents": documents,
-                "top_n": top_k,
-            },
-        )
-        resp.raise_for_status()
-        data = resp.json()
+    resp = await _get_client().post(
+        COHERE_RERANK_URL,
+        json={
+            "model": "rerank-v3.5",
+            "query": query,
+            "documents": documents,
+            "top_n": top_k,
+        },
+    )
+    resp.raise_for_status()
+    data = resp.json()
 
     reranked = []
     for item in data.get("results", []):
@@ -41,3 +79,24 @@ async def _cohere_rerank(query: str, results: list[dict], top_k: int) -> list[di
             reranked.append(entry)
 
     return reranked
+
+
+def _local_rerank(query: str, results: list[dict], top_k: int) -> list[dict]:
+    if _cross_encoder is None:
+        raise RuntimeError("reranker not initialized")
+    documents = [r.get("text", "") for r in results]
+    if not documents:
+        return []
+
+    logits = list(_cross_encoder.rerank(query, documents))
+    order = sorted(range(len(logits)), key=logits.__getitem__, reverse=True)[:top_k]
+
+    reranked = []
+    for idx in order:
+        entry = dict(results[idx])
+        # ms-marco cross-encoders emit logits; squash to 0-1 so the
+        # similarity_threshold gate means the same as with cohere scores
+        entry["rerank_score"] = 1.0 / (1.0 + math.exp(-logits[idx]))
+        reranked.append(entry)
+
+    return reranked
@@ -1,33 +1,122 @@
-from datetime import datetime, timezone
 from dataclasses import dataclass, field
-from collections import defaultdict
+from datetime import datetime
+from typing import Generic, TypeVar
+
+import orjson
 
 from app.config import settings
+from app.models.base import now_cached
 
 
 @dataclass
 class Turn:
     speaker: str
-    text: str
-    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    fragments: list[str]
+    timestamp: datetime = field(default_factory=now_cached)
+    _text: str | None = field(default=None, init=False, repr=False, compare=False)
+    _json: bytes | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def text(self) -> str:
+        # joined lazily so consolidating a long monologue stays linear
+        if self._text is None:
+            self._text = " ".join(self.fragments)
+        return self._text
+
+    def append(self, text: str):
+        self.fragments.append(text)
+        self._text = None
+        self._json = None
+
+    def to_json(self) -> bytes:
+        """orjson-encoded turn, cached until the next append"""
+        if self._json is None:
+            self._json = orjson.dumps(
+                {"speaker": self.speaker, "text": self.text, "timestamp": self.timestamp}
+            )
+        return self._json
+
+
+T = TypeVar("T")
+
+
+class RingBuffer(Generic[T]):
+    """fixed-capacity circular list; appending when full overwrites the oldest
+    item. tail() copies out with at most two contiguous slices"""
+
+    __slots__ = ("_arr", "_head", "_size")
+
+    def __init__(self, capacity: int):
+        self._arr: list[T | None] = [None] * capacity
+        self._head = 0  # next write slot
+        self._size = 0
 
+    def append(self, item: T):
+        self._arr[self._head] = item
+        self._head = (self._head + 1) % len(self._arr)
+        if self._size < len(self._arr):
+            self._size += 1
 
-_buffers: dict[str, list[Turn]] = defaultdict(list)
+    def tail(self) -> list[T]:
+        """all items, oldest first"""
+        n = self._size
+        if n == 0:
+            return []
+        start = (self._head - n) % len(self._arr)
+        if start + n <= len(self._arr):
+            return self._arr[start : start + n]
+        return self._arr[start:] + self._arr[: self._head]
 
+    def _slot(self, index: int) -> int:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("ring buffer index out of range")
+        return (self._head - self._size + index) % len(self._arr)
 
-def add_turn(session_id: str, speaker: str, text: str):
+    def __getitem__(self, index: int) -> T:
+        return self._arr[self._slot(index)]
+
+    def __len__(self) -> int:
+        return self._size
+
+
+# bounded per-session window; appending past transcript_turns drops the oldest
+# turn. only add_turn creates entries, so reads never leave empty buffers behind
+_buffers: dict[str, RingBuffer[Turn]] = {}
+
+
+def add_turn(session_id: str, speaker: str, text: str) -> tuple[Turn, bool]:
+    """append a segment; returns the turn it landed in and whether it was
+    merged into the previous turn. a merge touches neither the joined text
+    nor the json, so a long monologue stays linear"""
     # consolidate consecutive segments from same speaker
-    turns = _buffers[session_id]
+    turns = _buffers.get(session_id)
+    if turns is None:
+        turns = _buffers[session_id] = RingBuffer(settings.transcript_turns)
     if turns and turns[-1].speaker == speaker:
-        turns[-1].text += " " + text
-        turns[-1].timestamp = datetime.now(timezone.utc)
-    else:
-        turns.append(Turn(speaker=speaker, text=text))
-    _enforce_window(session_id)
+        turn = turns[-1]
+        turn.append(text)
+        turn.timestamp = now_cached()
+        return turn, True
+    turn = Turn(speaker=speaker, fragments=[text])
+    turns.append(turn)
+    return turn, False
 
 
 def get_turns(session_id: str) -> list[Turn]:
-    return list(_buffers.get(session_id, []))
+    turns = _buffers.get(session_id)
+    return turns.tail() if turns else []
+
+
+def buffer_size(session_id: str) -> int:
+    return len(_buffers.get(session_id, ()))
+
+
+def get_encoded_turns(session_id: str) -> list[bytes]:
+    """json bytes of each buffered turn, oldest first"""
+    turns = _buffers.get(session_id)
+    return [t.to_json() for t in turns.tail()] if turns else []
 
 
 def format_turns(turns: list[Turn]) -> str:
@@ -37,8 +126,3 @@ def format_turns(turns: list[Turn]) -> str:
 def clear_buffer(session_id: str):
     _buffers.pop(session_id, None)
 
-
-def _enforce_window(session_id: str):
-    turns = _buffers[session_id]
-    while len(turns) > settings.transcript_turns:
-        turns.pop(0)
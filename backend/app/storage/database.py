@@ -9,7 +9,16 @@ _pool: asyncpg.Pool | None = None
 
 async def init_db():
     global _pool
-    _pool = await asyncpg.create_pool(settings.database_url)
+    _pool = await asyncpg.create_pool(
+        settings.database_url,
+        min_size=settings.db_pool_min,
+        max_size=settings.db_pool_max,
+        max_inactive_connection_lifetime=300,
+        # asyncpg prepares each distinct query once per connection and reuses it
+        statement_cache_size=1024,
+        # short OLTP lookups never amortize JIT compilation
+        server_settings={"jit": "off", "application_name": "axio"},
+    )
     async with _pool.acquire() as conn:
         await conn.execute(SCHEMA)
 
@@ -65,6 +74,28 @@ CREATE TABLE IF NOT EXISTS chunks (
     parent_text TEXT,
     section_title TEXT
 );
+
+CREATE INDEX IF NOT EXISTS sessions_case_id_idx ON sessions(case_id);
+CREATE INDEX IF NOT EXISTS documents_case_id_idx ON documents(case_id);
+CREATE INDEX IF NOT EXISTS chunks_case_id_idx ON chunks(case_id);
+
+-- vectors are raw little-endian float32 bytes. the cache first shipped with a
+-- REAL[] column; it only holds recomputable data, so drop that version
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'embedding_cache' AND column_name = 'vector'
+            AND data_type = 'ARRAY'
+    ) THEN
+        DROP TABLE embedding_cache;
+    END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    hash BYTEA PRIMARY KEY,
+    vector BYTEA NOT NULL
+);
 """
 
 
@@ -80,16 +111,31 @@ async def create_case(case: Case):
 
 async def get_case(case_id: str) -> Case | None:
     pool = _get_pool()
-    row = await pool.fetchrow("SELECT * FROM cases WHERE id = $1", case_id)
+    row = await pool.fetchrow(f"SELECT {_CASE_COLUMNS} FROM cases WHERE id = $1", case_id)
     if not row:
         return None
-    return Case(id=row["id"], name=row["name"], description=row["description"], created_at=row["created_at"])
+    return _case_from_row(row)
+
+
+async def case_exists(case_id: str) -> bool:
+    """existence check for callers that only validate a case id"""
+    pool = _get_pool()
+    return await pool.fetchval("SELECT EXISTS(SELECT 1 FROM cases WHERE id = $1)", case_id)
 
 
 async def list_cases() -> list[Case]:
     pool = _get_pool()
-    rows = await pool.fetch("SELECT * FROM cases ORDER BY created_at DESC")
-    return [Case(id=r["id"], name=r["name"], description=r["description"], created_at=r["created_at"]) for r in rows]
+    rows = await pool.fetch(f"SELECT {_CASE_COLUMNS} FROM cases ORDER BY created_at DESC")
+    return [_case_from_row(r) for r in rows]
+
+
+# rows are unpacked positionally, so these lists fix the SELECT column order
+_CASE_COLUMNS = "id, name, description, created_at"
+
+
+def _case_from_row(row: asyncpg.Record) -> Case:
+    id_, name, description, created_at = row
+    return Case(id=id_, name=name, description=description, created_at=created_at)
 
 
 # --- sessions ---
@@ -104,16 +150,27 @@ async def create_session(sess: Session):
 
 async def get_session(session_id: str) -> Session | None:
     pool = _get_pool()
-    row = await pool.fetchrow("SELECT * FROM sessions WHERE id = $1", session_id)
+    row = await pool.fetchrow(f"SELECT {_SESSION_COLUMNS} FROM sessions WHERE id = $1", session_id)
     if not row:
         return None
-    return Session(id=row["id"], case_id=row["case_id"], treatment=Treatment(row["treatment"]), created_at=row["created_at"])
+    return _session_from_row(row)
 
 
 async def get_sessions_for_case(case_id: str) -> list[Session]:
     pool = _get_pool()
-    rows = await pool.fetch("SELECT * FROM sessions WHERE case_id = $1 ORDER BY created_at DESC", case_id)
-    return [Session(id=r["id"], case_id=r["case_id"], treatment=Treatment(r["treatment"]), created_at=r["created_at"]) for r in rows]
+    rows = await pool.fetch(
+        f"SELECT {_SESSION_COLUMNS} FROM sessions WHERE case_id = $1 ORDER BY created_at DESC",
+        case_id,
+    )
+    return [_session_from_row(r) for r in rows]
+
+
+_SESSION_COLUMNS = "id, case_id, treatment, created_at"
+
+
+def _session_from_row(row: asyncpg.Record) -> Session:
+    id_, case_id, treatment, created_at = row
+    return Session(id=id_, case_id=case_id, treatment=Treatment(treatment), created_at=created_at)
 
 
 # --- documents ---
@@ -129,51 +186,102 @@ async def save_document(doc: Document):
 
 async def get_document(doc_id: str) -> Document | None:
     pool = _get_pool()
-    row = await pool.fetchrow("SELECT * FROM documents WHERE id = $1", doc_id)
+    row = await pool.fetchrow(f"SELECT {_DOCUMENT_COLUMNS} FROM documents WHERE id = $1", doc_id)
     if not row:
         return None
-    return Document(
-        id=row["id"], case_id=row["case_id"], party=row["party"], filename=row["filename"],
-        page_count=row["page_count"], storage_path=row["storage_path"], created_at=row["created_at"],
-    )
+    return _document_from_row(row)
 
 
 async def get_documents_for_case(case_id: str) -> list[Document]:
     pool = _get_pool()
-    rows = await pool.fetch("SELECT * FROM documents WHERE case_id = $1 ORDER BY created_at DESC", case_id)
-    return [
-        Document(
-            id=r["id"], case_id=r["case_id"], party=r["party"], filename=r["filename"],
-            page_count=r["page_count"], storage_path=r["storage_path"], created_at=r["created_at"],
-        )
-        for r in rows
-    ]
+    rows = await pool.fetch(
+        f"SELECT {_DOCUMENT_COLUMNS} FROM documents WHERE case_id = $1 ORDER BY created_at DESC",
+        case_id,
+    )
+    return [_document_from_row(r) for r in rows]
+
+
+_DOCUMENT_COLUMNS = "id, case_id, party, filename, page_count, storage_path, created_at"
+
+
+def _document_from_row(row: asyncpg.Record) -> Document:
+    id_, case_id, party, filename, page_count, storage_path, created_at = row
+    return Document(
+        id=id_, case_id=case_id, party=party, filename=filename,
+        page_count=page_count, storage_path=storage_path, created_at=created_at,
+    )
 
 
 # --- chunks ---
 
+_CHUNK_COLUMNS = (
+    "id", "doc_id", "case_id", "party", "filename", "page",
+    "start_char", "end_char", "text", "parent_text", "section_title",
+)
+
+
 async def save_chunks(chunks: list[Chunk]):
+    """bulk load over binary COPY into a staging table, then upsert in one statement"""
     pool = _get_pool()
-    async with pool.acquire() as conn:
-        for chunk in chunks:
-            await conn.execute(
-                "INSERT INTO chunks (id, doc_id, case_id, party, filename, page, start_char, end_char, text, parent_text, section_title) "
-                "VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11) "
-                "ON CONFLICT (id) DO UPDATE SET text = EXCLUDED.text",
-                chunk.id, chunk.doc_id, chunk.case_id, chunk.party, chunk.filename,
-                chunk.page, chunk.start_char, chunk.end_char, chunk.text,
-                chunk.parent_text, chunk.section_title,
-            )
+    # one INSERT ... ON CONFLICT cannot touch the same id twice; keep the last
+    # row per id, as the old per-row upsert did
+    records = list({
+        c.id: (
+            c.id, c.doc_id, c.case_id, c.party, c.filename, c.page,
+            c.start_char, c.end_char, c.text, c.parent_text, c.section_title,
+        )
+        for c in chunks
+    }.values())
+    columns = ", ".join(_CHUNK_COLUMNS)
+    async with pool.acquire() as conn, conn.transaction():
+        await conn.execute(
+            "CREATE TEMP TABLE chunks_staging (LIKE chunks INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        await conn.copy_records_to_table(
+            "chunks_staging", records=records, columns=_CHUNK_COLUMNS,
+        )
+        await conn.execute(
+            f"INSERT INTO chunks ({columns}) SELECT {columns} FROM chunks_staging "
+            "ON CONFLICT (id) DO UPDATE SET text = EXCLUDED.text"
+        )
 
 
 async def get_chunk(chunk_id: str) -> Chunk | None:
     pool = _get_pool()
-    row = await pool.fetchrow("SELECT * FROM chunks WHERE id = $1", chunk_id)
+    row = await pool.fetchrow(
+        f"SELECT {', '.join(_CHUNK_COLUMNS)} FROM chunks WHERE id = $1", chunk_id,
+    )
     if not row:
         return None
+    return _chunk_from_row(row)
+
+
+def _chunk_from_row(row: asyncpg.Record) -> Chunk:
+    (
+        id_, doc_id, case_id, party, filename, page,
+        start_char, end_char, text, parent_text, section_title,
+    ) = row
     return Chunk(
-        id=row["id"], doc_id=row["doc_id"], case_id=row["case_id"], party=row["party"],
-        filename=row["filename"], page=row["page"], start_char=row["start_char"],
-        end_char=row["end_char"], text=row["text"], parent_text=row["parent_text"],
-        section_title=row["section_title"],
+        id=id_, doc_id=doc_id, case_id=case_id, party=party, filename=filename, page=page,
+        start_char=start_char, end_char=end_char, text=text, parent_text=parent_text,
+        section_title=section_title,
+    )
+
+
+# --- embedding cache ---
+
+async def get_cached_embeddings(keys: list[bytes]) -> dict[bytes, bytes]:
+    """float32 vector bytes by hash; decoding is left to the caller"""
+    pool = _get_pool()
+    rows = await pool.fetch(
+        "SELECT hash, vector FROM embedding_cache WHERE hash = ANY($1::bytea[])", keys,
+    )
+    return {r["hash"]: r["vector"] for r in rows}
+
+
+async def save_cached_embeddings(entries: dict[bytes, bytes]):
+    pool = _get_pool()
+    await pool.executemany(
+        "INSERT INTO embedding_cache (hash, vector) VALUES ($1, $2) ON CONFLICT (hash) DO NOTHING",
+        list(entries.items()),
     )
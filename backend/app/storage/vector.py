@@ -1,7 +1,11 @@
+import asyncio
+import functools
 import hashlib
 import re
 from collections import Counter
 
+import numpy as np
+import xxhash
 from qdrant_client import AsyncQdrantClient
 from qdrant_client.models import (
     Distance,
@@ -21,36 +25,65 @@ from qdrant_client.models import (
 from app.config import settings
 from app.models.document import Chunk
 
-DENSE_DIM = 1536
+DENSE_DIM = settings.embedding_dim
+
+# greedy \w{2,} already stops at word boundaries, so no \b anchors needed
+_TOKEN_RE = re.compile(r"\w{2,}")
+
+UPSERT_BATCH_SIZE = 256
+# collection metadata key recording which hashing scheme its points use
+SCHEMA_VERSION_KEY = "vector_schema_version"
 
 _client: AsyncQdrantClient | None = None
+_initialized = False  # collection verified or created by init_qdrant
+_upsert_semaphore = asyncio.Semaphore(4)
 
 
 def _chunk_id_to_point_id(chunk_id: str) -> str:
-    h = hashlib.sha256(chunk_id.encode()).hexdigest()
+    if settings.vector_schema_version < 2:
+        h = hashlib.sha256(chunk_id.encode()).hexdigest()
+    else:
+        h = xxhash.xxh128_hexdigest(chunk_id.encode())
     return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:32]}"
 
 
-def _word_hash(word: str) -> int:
-    """deterministic 31-bit hash for sparse vector indices"""
+def _word_hash_md5(word: str) -> int:
     return int(hashlib.md5(word.encode()).hexdigest()[:8], 16) % (2**31)
 
 
+def _word_hash_xxh32(word: str) -> int:
+    return xxhash.xxh32_intdigest(word.encode()) & 0x7FFFFFFF
+
+
+# deterministic 31-bit hash for sparse vector indices. schema 1 (md5) matches
+# collections ingested before the xxhash switch; those need a re-ingest for 2.
+_word_hash = _word_hash_md5 if settings.vector_schema_version < 2 else _word_hash_xxh32
+
+
 def sparse_encode(text: str) -> SparseVector:
     """encode text into sparse BM25 vector using word term frequency.
     qdrant Modifier.IDF handles the IDF weighting server-side."""
-    tokens = re.findall(r'\b\w{2,}\b', text.lower())
+    indices, values = _sparse_encode_cached(text)
+    return SparseVector(indices=list(indices), values=list(values))
+
+
+# re-ingested documents and repeated challenge queries hit the same texts;
+# tuples because the cached value must not be mutated by callers
+@functools.lru_cache(maxsize=4096)
+def _sparse_encode_cached(text: str) -> tuple[tuple[int, ...], tuple[float, ...]]:
+    tokens = _TOKEN_RE.findall(text.lower())
     if not tokens:
-        return SparseVector(indices=[0], values=[0.0])
+        return (0,), (0.0,)
+    # hash-based term counts; sorting the words first would be wasted work
+    # since only the hash indices need to come out ordered
     freq = Counter(tokens)
-    pairs = sorted((_word_hash(w), float(c)) for w, c in freq.items())
-    # deduplicate collisions by summing values
-    merged: dict[int, float] = {}
-    for idx, val in pairs:
-        merged[idx] = merged.get(idx, 0.0) + val
-    indices = sorted(merged.keys())
-    values = [merged[i] for i in indices]
-    return SparseVector(indices=indices, values=values)
+    counts = np.fromiter(freq.values(), dtype=np.int64, count=len(freq))
+    hashes = np.fromiter(map(_word_hash, freq), dtype=np.int64, count=len(freq))
+    # deduplicate collisions by summing counts; unique() also sorts the indices
+    indices, inverse = np.unique(hashes, return_inverse=True)
+    values = np.zeros(len(indices), dtype=np.float64)
+    np.add.at(values, inverse, counts)
+    return tuple(indices.tolist()), tuple(values.tolist())
 
 
 async def _get_client() -> AsyncQdrantClient:
@@ -61,32 +94,68 @@ async def _get_client() -> AsyncQdrantClient:
 
 
 async def init_qdrant():
+    global _initialized
+    if _initialized:
+        return
     client = await _get_client()
-    collections = await client.get_collections()
-    names = [c.name for c in collections.collections]
-    if settings.qdrant_collection not in names:
+    name = settings.qdrant_collection
+    version = settings.vector_schema_version
+    if not await client.collection_exists(name):
         await client.create_collection(
-            collection_name=settings.qdrant_collection,
+            collection_name=name,
             vectors_config={
                 "dense": VectorParams(size=DENSE_DIM, distance=Distance.COSINE),
             },
             sparse_vectors_config={
                 "bm25": SparseVectorParams(modifier=Modifier.IDF),
             },
+            metadata={SCHEMA_VERSION_KEY: version},
         )
+    else:
+        await _check_schema_version(client, name, version)
+    _initialized = True
+
+
+async def _check_schema_version(client: AsyncQdrantClient, name: str, version: int):
+    """hashes from another schema version silently stop matching, so refuse to
+    serve a collection ingested under a different one. an empty collection is
+    simply relabelled"""
+    info = await client.get_collection(name)
+    # collections created before the version was recorded all used md5 (schema 1)
+    stored = (info.config.metadata or {}).get(SCHEMA_VERSION_KEY, 1)
+    if stored == version:
+        return
+    if not info.points_count:
+        await client.update_collection(name, metadata={SCHEMA_VERSION_KEY: version})
+        return
+    raise RuntimeError(
+        f"qdrant collection {name!r} holds vector schema {stored} points but "
+        f"VECTOR_SCHEMA_VERSION={version}; set VECTOR_SCHEMA_VERSION={stored} or "
+        f"re-ingest into a new QDRANT_COLLECTION"
+    )
 
 
-async def upsert_chunks(chunks: list[Chunk], embeddings: list[list[float]]):
+async def close_qdrant():
+    global _client, _initialized
+    if _client:
+        await _client.close()
+        _client = None
+    _initialized = False
+
+
+async def upsert_chunks(chunks: list[Chunk], embeddings: np.ndarray):
     if not chunks:
         return
     client = await _get_client()
+    # one worker thread for the whole batch; per-text threads would just
+    # contend for the GIL
+    sparse_vectors = await asyncio.to_thread(lambda: [sparse_encode(c.text) for c in chunks])
     points = []
-    for chunk, emb in zip(chunks, embeddings):
+    for chunk, emb, sparse in zip(chunks, embeddings, sparse_vectors):
         point_id = _chunk_id_to_point_id(chunk.id)
-        sparse = sparse_encode(chunk.text)
         points.append(PointStruct(
             id=point_id,
-            vector={"dense": emb, "bm25": sparse},
+            vector={"dense": emb.tolist(), "bm25": sparse},
             payload={
                 "chunk_id": chunk.id,
                 "doc_id": chunk.doc_id,
@@ -102,16 +171,21 @@ async def upsert_chunks(chunks: list[Chunk], embeddings: list[list[float]]):
             },
         ))
 
-    batch_size = 100
-    for i in range(0, len(points), batch_size):
-        batch = points[i : i + batch_size]
-        await client.upsert(collection_name=settings.qdrant_collection, points=batch)
+    # batches go out concurrently, bounded by the semaphore
+    async def upsert_batch(batch: list[PointStruct]):
+        async with _upsert_semaphore:
+            await client.upsert(collection_name=settings.qdrant_collection, points=batch)
+
+    await asyncio.gather(*(
+        upsert_batch(points[i : i + UPSERT_BATCH_SIZE])
+        for i in range(0, len(points), UPSERT_BATCH_SIZE)
+    ))
 
 
 async def hybrid_search(
     case_id: str,
     query_text: str,
-    query_embedding: list[float],
+    query_embedding: np.ndarray,
     top_k: int = 20,
 ) -> list[dict]:
     """dense + BM25 sparse search fused with RRF"""
@@ -119,13 +193,13 @@ async def hybrid_search(
     case_filter = Filter(
         must=[FieldCondition(key="case_id", match=MatchValue(value=case_id))]
     )
-    sparse_query = sparse_encode(query_text)
+    sparse_query = await asyncio.to_thread(sparse_encode, query_text)
 
     response = await client.query_points(
         collection_name=settings.qdrant_collection,
         prefetch=[
             Prefetch(
-                query=query_embedding,
+                query=query_embedding.tolist(),
                 using="dense",
                 limit=top_k,
                 filter=case_filter,
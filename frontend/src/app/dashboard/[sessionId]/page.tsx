@@ -14,7 +14,7 @@ import {
 } from "lucide-react";
 import {
   getSession,
-  triggerChallenge,
+  streamChallenge,
   connectTranscriptWs,
   getChunkContext,
   type Session,
@@ -60,7 +60,10 @@ export default function DashboardPage() {
     const ws = connectTranscriptWs(sessionId);
     wsRef.current = ws;
 
-    ws.onopen = () => setWsConnected(true);
+    ws.onopen = () => {
+      setWsConnected(true);
+      ws.send(JSON.stringify({ op: "resync" }));
+    };
     ws.onclose = () => setWsConnected(false);
     ws.onerror = () => setWsConnected(false);
 
@@ -68,6 +71,21 @@ export default function DashboardPage() {
       const data = JSON.parse(e.data);
       if (data.turns) {
         setTurns(data.turns);
+      } else if (data.turn) {
+        const turn: TranscriptTurn = data.turn;
+        const size: number = data.buffer_size;
+        // a new turn; the server trims its buffer to buffer_size
+        setTurns((prev) => [...prev, turn].slice(-size));
+      } else if (data.append !== undefined) {
+        // a segment merged into the last turn; only the new text is echoed
+        setTurns((prev) => {
+          const last = prev[prev.length - 1];
+          if (!last || last.speaker !== data.speaker) return prev;
+          return [
+            ...prev.slice(0, -1),
+            { ...last, text: `${last.text} ${data.append}`, timestamp: data.timestamp },
+          ];
+        });
       }
     };
 
@@ -94,7 +112,7 @@ export default function DashboardPage() {
     setChallenging(true);
     const start = Date.now();
     try {
-      const result = await triggerChallenge(sessionId);
+      const result = await streamChallenge(sessionId, setChallenge);
       setChallengeTime(Date.now() - start);
       setChallenge(result);
     } catch (e) {
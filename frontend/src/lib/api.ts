@@ -124,12 +124,72 @@ export async function listDocuments(caseId: string): Promise<Document[]> {
 
 // --- challenge ---
 
-export async function triggerChallenge(
-  sessionId: string
+type StreamedField = "summary" | "party_a_evidence" | "party_b_evidence";
+
+// streamed challenge: onUpdate gets the partial response as citations and
+// text deltas arrive; resolves with the final response. the body is read as
+// SSE frames ("event: <name>\ndata: <json>\n\n") so 4xx details still surface
+export async function streamChallenge(
+  sessionId: string,
+  onUpdate: (partial: ChallengeResponse) => void
 ): Promise<ChallengeResponse> {
-  const res = await fetch(`${API}/challenge/${sessionId}`, { method: "POST" });
+  const res = await fetch(`${API}/challenge/${sessionId}/stream`, { method: "POST" });
   if (!res.ok) throw new Error(await res.text());
-  return res.json();
+  if (!res.body) throw new Error("challenge stream unavailable");
+
+  let result: ChallengeResponse = {
+    treatment: "",
+    query_used: "",
+    no_evidence: false,
+    summary: "",
+    citations: [],
+    party_a_evidence: "",
+    party_a_citations: [],
+    party_b_evidence: "",
+    party_b_citations: [],
+  };
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffered = "";
+
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffered += value;
+
+    let end: number;
+    while ((end = buffered.indexOf("\n\n")) !== -1) {
+      const frame = buffered.slice(0, end);
+      buffered = buffered.slice(end + 2);
+
+      let event = "message";
+      let data = "";
+      for (const line of frame.split("\n")) {
+        if (line.startsWith("event: ")) event = line.slice(7);
+        else if (line.startsWith("data: ")) data += line.slice(6);
+      }
+      const payload = JSON.parse(data);
+
+      switch (event) {
+        case "citations":
+          result = { ...result, ...payload };
+          onUpdate(result);
+          break;
+        case "delta": {
+          const { field, text } = payload as { field: StreamedField; text: string };
+          result = { ...result, [field]: result[field] + text };
+          onUpdate(result);
+          break;
+        }
+        case "result":
+          return { ...result, ...payload };
+        case "done":
+          return result;
+        case "error":
+          throw new Error(payload.detail);
+      }
+    }
+  }
+  throw new Error("challenge stream ended early");
 }
 
 // --- evidence ---